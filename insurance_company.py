@@ -1,18 +1,71 @@
-from typing import Dict, Any, List, Tuple
+import logging
+import math
+import statistics
+import sys
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from iorp import IORP, Asset, Position
 from sme import SME
 
+logger = logging.getLogger(__name__)
+
+INDUSTRY_RISK_FACTORS = {
+    "manufacturing": 1.2,
+    "construction": 1.5,
+    "retail": 0.9,
+    "finance": 1.0,
+    "technology": 0.8
+}
+
+# Risk profile adjustment for each credit rating, unknown ratings leave the risk profile unchanged
+RATING_RISK_ADJUSTMENTS = {"A": -0.1, "B": 0.1, "C": 0.2, "D": 0.3}
+
+# Lower bounds (exclusive) of the credit score bands and the risk profile adjustment for each band, from the
+# band at or below 500 up to the band above 800
+CREDIT_SCORE_BANDS = (500, 600, 700, 800)
+CREDIT_SCORE_RISK_ADJUSTMENTS = (0.0, 0.3, 0.2, 0.1, -0.1)
+
+# Risk profile adjustment for a non-positive and a positive net income or asset value, indexed by the comparison
+FINANCIAL_STATEMENT_RISK_ADJUSTMENTS = (0.1, -0.1)
+
+# Maximum coverage and probability of claim for each credit rating, all other ratings fall back to the defaults
+MAXIMUM_COVERAGE_BY_RATING = {"A": 1000000, "B": 500000}
+DEFAULT_MAXIMUM_COVERAGE = 100000
+PROBABILITY_OF_CLAIM_BY_RATING = {"A": 0.01, "B": 0.03}
+DEFAULT_PROBABILITY_OF_CLAIM = 0.05
+
+# Share of the coverage amount reinsured for a sufficiently large IORP with each risk profile
+REINSURANCE_SHARE_BY_RISK_PROFILE = {"low": 1.0, "medium": 0.75, "high": 0.50}
+
+# Largest argument for which math.exp does not overflow
+_MAX_EXP_ARGUMENT = math.log(sys.float_info.max)
+
+
+@lru_cache(maxsize=4096)
+def _compound_growth(rate: float, term: int) -> float:
+    """Calculate the compound growth (1 + rate) ** term - 1, cached since scenario sweeps reuse the same inputs.
+
+    The growth is calculated as expm1(term * log1p(rate)), which stays accurate for small rates where subtracting 1
+    from (1 + rate) ** term would cancel most significant digits.
+    """
+    return math.expm1(term * math.log1p(rate))
+
 
 class InsuranceCompany:
+    __slots__ = ("name", "_own_funds", "total_assets", "_market_risk_factor", "_operational_risk_factor",
+                 "total_liabilities", "num_shares_outstanding", "reinsurance_capacity", "low_market_risk_factor",
+                 "high_market_risk_factor", "low_operational_risk_factor", "high_operational_risk_factor", "_scr")
+
     def __init__(self, name: str, own_funds: float, total_assets: float, total_liabilities: float,
                  num_shares_outstanding: int, reinsurance_capacity: float, market_risk_factor: float, operational_risk_factor: float,
                  low_market_risk_factor: float = 0.8, high_market_risk_factor: float = 2.0,
                  low_operational_risk_factor: float = 0.9, high_operational_risk_factor: float = 2.5):
         self.name = name
-        self.own_funds = own_funds
+        self._own_funds = own_funds
         self.total_assets = total_assets
-        self.market_risk_factor = market_risk_factor
-        self.operational_risk_factor = operational_risk_factor
+        self._market_risk_factor = market_risk_factor
+        self._operational_risk_factor = operational_risk_factor
         self.total_liabilities = total_liabilities
         self.num_shares_outstanding = num_shares_outstanding
         self.reinsurance_capacity = reinsurance_capacity
@@ -20,6 +73,35 @@ class InsuranceCompany:
         self.high_market_risk_factor = high_market_risk_factor
         self.low_operational_risk_factor = low_operational_risk_factor
         self.high_operational_risk_factor = high_operational_risk_factor
+        self._scr = None
+
+    # The SCR is cached until one of the fields it is calculated from changes
+    @property
+    def own_funds(self) -> float:
+        return self._own_funds
+
+    @own_funds.setter
+    def own_funds(self, own_funds: float) -> None:
+        self._own_funds = own_funds
+        self._scr = None
+
+    @property
+    def market_risk_factor(self) -> float:
+        return self._market_risk_factor
+
+    @market_risk_factor.setter
+    def market_risk_factor(self, market_risk_factor: float) -> None:
+        self._market_risk_factor = market_risk_factor
+        self._scr = None
+
+    @property
+    def operational_risk_factor(self) -> float:
+        return self._operational_risk_factor
+
+    @operational_risk_factor.setter
+    def operational_risk_factor(self, operational_risk_factor: float) -> None:
+        self._operational_risk_factor = operational_risk_factor
+        self._scr = None
 
     # Calculate the MCR and SCR of an insurance company under different scenarios
     def calculate_solvency_metrics(self, total_assets: int, total_liabilities: int, own_funds: int,
@@ -35,23 +117,55 @@ class InsuranceCompany:
 
         return mcr, scr
 
+    def calculate_solvency_metrics_grid(self, total_assets: int, total_liabilities: int, own_funds: int,
+                                        solvency_capital_requirement_factor: float,
+                                        market_risk_factors: List[float], credit_risk_factors: List[float],
+                                        operational_risk_factors: List[float]) -> Tuple[
+        float, Dict[Tuple[float, float, float], float]]:
+        """Calculate the MCR and the SCR for every combination of market, credit and operational risk factors.
+
+        Args:
+            total_assets: The total assets of the insurance company.
+            total_liabilities: The total liabilities of the insurance company.
+            own_funds: The own funds of the insurance company.
+            solvency_capital_requirement_factor: The solvency capital requirement factor.
+            market_risk_factors: The market risk factors of the scenario grid.
+            credit_risk_factors: The credit risk factors of the scenario grid.
+            operational_risk_factors: The operational risk factors of the scenario grid.
+
+        Returns:
+            The MCR, which does not depend on the risk factors, and the SCR keyed by
+            (market risk factor, credit risk factor, operational risk factor).
+        """
+        mcr = (total_assets + total_liabilities + own_funds) * solvency_capital_requirement_factor
+
+        # Multiply in one risk factor per loop level so each partial product is shared by the inner scenarios
+        scrs = {}
+        for market_risk_factor in market_risk_factors:
+            market_scr = mcr * market_risk_factor
+            for operational_risk_factor in operational_risk_factors:
+                operational_scr = market_scr * operational_risk_factor
+                for credit_risk_factor in credit_risk_factors:
+                    scrs[market_risk_factor, credit_risk_factor, operational_risk_factor] = \
+                        operational_scr * credit_risk_factor
+
+        return mcr, scrs
+
     def calculate_scr_under_stress(self, total_assets: int, total_liabilities: int, own_funds: int,
                                    stress_test_scenarios: Dict[str, int]) -> Dict[str, float]:
-        # Initialize a dictionary to store the SCR factor under each stress test scenario
-        scr_factors = {}
-
-        # Iterate over the stress test scenarios
-        for scenario, capital_requirement in stress_test_scenarios.items():
-            # Calculate the SCR factor as the capital requirement divided by the sum of the total assets and total liabilities
-            scr_factor = capital_requirement / (total_assets + total_liabilities)
+        # The sum of the total assets and total liabilities is the same for every scenario
+        total_balance = total_assets + total_liabilities
 
-            # Add the SCR factor for this scenario to the dictionary
-            scr_factors[scenario] = scr_factor
-            return scr_factors
+        # Calculate the SCR factor under each stress test scenario as the capital requirement divided by the sum of
+        # the total assets and total liabilities
+        return {scenario: capital_requirement / total_balance
+                for scenario, capital_requirement in stress_test_scenarios.items()}
 
     def calculate_scr(self) -> float:
         """Calculate the solvency capital requirement (SCR) of the insurance company."""
-        return self.own_funds * self.market_risk_factor * self.operational_risk_factor
+        if self._scr is None:
+            self._scr = self._own_funds * self._market_risk_factor * self._operational_risk_factor
+        return self._scr
 
     def calculate_mcr(self) -> float:
         """Calculate the minimum capital requirement (MCR) of the insurance company."""
@@ -59,15 +173,15 @@ class InsuranceCompany:
 
     def stress_test_scr(self) -> Dict[str, float]:
         """Perform stress tests on the SCR of the insurance company under different market and operational risk scenarios."""
-        low_market_risk_scr = self.own_funds * self.low_market_risk_factor * self.operational_risk_factor
-        high_market_risk_scr = self.own_funds * self.high_market_risk_factor * self.operational_risk_factor
-        low_operational_risk_scr = self.own_funds * self.market_risk_factor * self.low_operational_risk_factor
-        high_operational_risk_scr = self.own_funds * self.market_risk_factor * self.high_operational_risk_factor
+        # Read the unstressed fields once, they are shared by all scenarios
+        own_funds = self._own_funds
+        market_risk_factor = self._market_risk_factor
+        operational_risk_factor = self._operational_risk_factor
         return {
-            "low_market_risk_scr": low_market_risk_scr,
-            "high_market_risk_scr": high_market_risk_scr,
-            "low_operational_risk_scr": low_operational_risk_scr,
-            "high_operational_risk_scr": high_operational_risk_scr
+            "low_market_risk_scr": own_funds * self.low_market_risk_factor * operational_risk_factor,
+            "high_market_risk_scr": own_funds * self.high_market_risk_factor * operational_risk_factor,
+            "low_operational_risk_scr": own_funds * market_risk_factor * self.low_operational_risk_factor,
+            "high_operational_risk_scr": own_funds * market_risk_factor * self.high_operational_risk_factor
         }
 
     def update_reinsurance_terms(self, iorp: IORP, reinsurance_amount: float):
@@ -79,7 +193,7 @@ class InsuranceCompany:
         """
         iorp.reinsurance_amount = reinsurance_amount
         iorp.reinsurance_terms_updated = True
-        print(f"Reinsurance terms updated for IORP {iorp.name} with reinsurance amount {reinsurance_amount}.")
+        logger.debug("Reinsurance terms updated for IORP %s with reinsurance amount %s.", iorp.name, reinsurance_amount)
 
     def implement_risk_mitigation(self, strategy: str) -> None:
         """
@@ -91,74 +205,58 @@ class InsuranceCompany:
             for position in self.positions:
                 if position.asset.price < position.stop_loss_price:
                     self.sell_position(position.asset, position.num_shares)
-                    print(
-                        f"Stop loss triggered for {position.asset.ticker} at price {position.stop_loss_price}. {position.num_shares} shares sold.")
+                    logger.debug("Stop loss triggered for %s at price %s. %s shares sold.",
+                                 position.asset.ticker, position.stop_loss_price, position.num_shares)
         elif strategy == "hedging":
             # Implement a hedging strategy to offset potential losses on an investment with gains from another investment
             for position in self.positions:
                 if position.asset.type == "stock":
                     hedge_asset = Asset("TLT", position.asset.price * -1)
                     self.add_position(hedge_asset, position.num_shares)
-                    print(f"Hedge added for {position.asset.ticker} with {hedge_asset.ticker}.")
+                    logger.debug("Hedge added for %s with %s.", position.asset.ticker, hedge_asset.ticker)
         else:
-            print(f"Invalid risk mitigation strategy: {strategy}")
+            logger.warning("Invalid risk mitigation strategy: %s", strategy)
 
     def calculate_risk_profile_sme(self, sme: SME) -> float:
-        credit_rating = sme.get_credit_rating()
-        credit_score = sme.get_credit_score()
-        financial_statements = sme.get_financial_statements()
+        financial_statements = sme.financial_statements
+        income_statement = financial_statements.get("income statement")
+        balance_sheet = financial_statements.get("balance sheet")
 
         # Calculate risk profile based on credit rating, credit score, and financial statements
-        risk_profile = 0.0
-        if sme.credit_rating == "A":
-            risk_profile -= 0.1
-        elif sme.credit_rating == "B":
-            risk_profile += 0.1
-        elif sme.credit_rating == "C":
-            risk_profile += 0.2
-        elif sme.credit_rating == "D":
-            risk_profile += 0.3
-
-        if sme.credit_score > 800:
-            risk_profile -= 0.1
-        elif sme.credit_score > 700:
-            risk_profile += 0.1
-        elif sme.credit_score > 600:
-            risk_profile += 0.2
-        elif sme.credit_score > 500:
-            risk_profile += 0.3
-
-        if "income statement" in financial_statements:
-            income_statement = financial_statements["income statement"]["net income"]
-            if income_statement > 0:
-                risk_profile -= 0.1
-            else:
-                risk_profile += 0.1
-
-        if "balance sheet" in financial_statements:
-            balance_sheet = financial_statements["balance sheet"]["assets"]
-            if balance_sheet > 0:
-                risk_profile -= 0.1
-            else:
-                risk_profile += 0.1
+        risk_profile = RATING_RISK_ADJUSTMENTS.get(sme.credit_rating, 0.0)
+        risk_profile += CREDIT_SCORE_RISK_ADJUSTMENTS[bisect_left(CREDIT_SCORE_BANDS, sme.credit_score)]
+
+        if income_statement is not None:
+            risk_profile += FINANCIAL_STATEMENT_RISK_ADJUSTMENTS[income_statement["net income"] > 0]
+
+        if balance_sheet is not None:
+            risk_profile += FINANCIAL_STATEMENT_RISK_ADJUSTMENTS[balance_sheet["assets"] > 0]
 
         return risk_profile
 
-    def calculate_maximum_coverage(self, sme: SME) -> float:
-        # Calculate debt-to-equity ratio
-        debt_to_equity_ratio = sme.liabilities / sme.financial_statements["balance sheet"]["equity"]
+    def _calculate_financial_ratios(self, sme: SME) -> Tuple[float, float]:
+        """Calculates the debt-to-equity ratio and the current ratio of the SME.
 
-        # Calculate current ratio
-        current_ratio = sme.assets / sme.liabilities
+        Args:
+            sme: The SME for which the financial ratios are being calculated.
+
+        Returns:
+            The debt-to-equity ratio and the current ratio of the SME.
+        """
+        return sme.debt_to_equity_ratio(), sme.assets / sme.liabilities
+
+    def calculate_maximum_coverage(self, sme: SME, risk_profile: Optional[float] = None,
+                                   financial_ratios: Optional[Tuple[float, float]] = None) -> float:
+        if risk_profile is None:
+            risk_profile = self.calculate_risk_profile_sme(sme)
+        if financial_ratios is None:
+            financial_ratios = self._calculate_financial_ratios(sme)
+
+        debt_to_equity_ratio, current_ratio = financial_ratios
         # Set maximum coverage based on credit rating, industry, and financial ratios
-        if sme.credit_rating == "A":
-            max_coverage = 1000000
-        elif sme.credit_rating == "B":
-            max_coverage = 500000
-        else:
-            max_coverage = 100000
+        max_coverage = MAXIMUM_COVERAGE_BY_RATING.get(sme.credit_rating, DEFAULT_MAXIMUM_COVERAGE)
         # Adjust for industry risk
-        max_coverage *= (1 + self.calculate_risk_profile_sme(sme))
+        max_coverage *= (1 + risk_profile)
         # Adjust for financial ratios
         if debt_to_equity_ratio > 1:
             max_coverage *= 0.9
@@ -173,22 +271,17 @@ class InsuranceCompany:
 
         return premium
 
-    def calculate_probability_of_claim(self, sme: SME) -> float:
+    def calculate_probability_of_claim(self, sme: SME, risk_profile: Optional[float] = None,
+                                       financial_ratios: Optional[Tuple[float, float]] = None) -> float:
+        if risk_profile is None:
+            risk_profile = self.calculate_risk_profile_sme(sme)
+        if financial_ratios is None:
+            financial_ratios = self._calculate_financial_ratios(sme)
 
-        debt_to_equity_ratio = sme.liabilities / sme.financial_statements["balance sheet"]["equity"]
-
-        # Calculate current ratio
-        current_ratio = sme.assets / sme.liabilities
-        probability_of_claim = 0
-        credit_rating = sme.credit_rating
-        if credit_rating == "A":
-            probability_of_claim = 0.01
-        elif credit_rating == "B":
-            probability_of_claim = 0.03
-        else:
-            probability_of_claim = 0.05
+        debt_to_equity_ratio, current_ratio = financial_ratios
+        probability_of_claim = PROBABILITY_OF_CLAIM_BY_RATING.get(sme.credit_rating, DEFAULT_PROBABILITY_OF_CLAIM)
         # Adjust for industry risk
-        probability_of_claim *= (1 + self.calculate_risk_profile_sme(sme))
+        probability_of_claim *= (1 + risk_profile)
         # Adjust for financial ratios
         if debt_to_equity_ratio > 1:
             probability_of_claim *= 1.1
@@ -196,80 +289,171 @@ class InsuranceCompany:
             probability_of_claim *= 1.1
         return probability_of_claim
 
-    def calculate_potential_severity_of_claim(self, sme: SME) -> float:
+    def calculate_potential_severity_of_claim(self, sme: SME,
+                                              financial_ratios: Optional[Tuple[float, float]] = None) -> float:
         """Calculates the potential severity of a claim based on the SME's industry and financial statements.
 
         Args:
             sme: The SME for which the potential severity of a claim is being calculated.
+            financial_ratios: The debt-to-equity ratio and current ratio of the SME, calculated if not given.
 
         Returns:
             The potential severity of a claim.
         """
         industry_risk = INDUSTRY_RISK_FACTORS[sme.industry]
-        financial_risk = self._calculate_financial_risk(sme)
+        financial_risk = self._calculate_financial_risk(sme, financial_ratios)
         return industry_risk * financial_risk
 
-    def _calculate_financial_risk(self, sme: SME) -> float:
+    def _calculate_financial_risk(self, sme: SME, financial_ratios: Optional[Tuple[float, float]] = None) -> float:
         """Calculates the financial risk of the SME based on its financial statements.
 
         Args:
             sme: The SME for which the financial risk is being calculated.
+            financial_ratios: The debt-to-equity ratio and current ratio of the SME, calculated if not given.
 
         Returns:
             The financial risk of the SME.
         """
-        debt_to_equity_ratio = sme.liabilities / sme.financial_statements["balance sheet"]["equity"]
-        current_ratio = sme.assets / sme.liabilities
+        if financial_ratios is None:
+            financial_ratios = self._calculate_financial_ratios(sme)
+        debt_to_equity_ratio, current_ratio = financial_ratios
         return debt_to_equity_ratio * current_ratio
 
     def calculate_premium(self, sme: SME) -> float:
-        max_coverage = self.calculate_maximum_coverage(sme)
-        probability_of_claim = self.calculate_probability_of_claim(sme)
-        potential_severity_of_claim = self.calculate_potential_severity_of_claim(sme)
+        # Calculate the risk profile and financial ratios once and share them between the coverage, claim
+        # probability and claim severity calculations
+        risk_profile = self.calculate_risk_profile_sme(sme)
+        financial_ratios = self._calculate_financial_ratios(sme)
+        max_coverage = self.calculate_maximum_coverage(sme, risk_profile, financial_ratios)
+        probability_of_claim = self.calculate_probability_of_claim(sme, risk_profile, financial_ratios)
+        potential_severity_of_claim = self.calculate_potential_severity_of_claim(sme, financial_ratios)
         return max_coverage * probability_of_claim * potential_severity_of_claim
 
+    def calculate_portfolio_premiums(self, smes: List[SME]) -> List[float]:
+        """Calculate the premium for each SME in a portfolio.
+
+        Args:
+            smes: The SMEs to be priced.
+
+        Returns:
+            The premiums, in the same order as the SMEs.
+        """
+        calculate_premium = self.calculate_premium
+        return [calculate_premium(sme) for sme in smes]
+
     # The function returns the premium (in dollars) that the insurance company would charge for the annuity
     def calculate_annuity_premium(self, amount: int, term: int, interest_rate: float, inflation_rate: float) -> float:
+        # Calculate the compound interest growth once, it is needed for both the present and the future value
+        interest_growth = _compound_growth(interest_rate, term)
+
         # Calculate the present value of the annuity
-        present_value = amount / ((1 + interest_rate) ** term - 1)
+        present_value = amount / interest_growth
 
         # Calculate the future value of the annuity
-        future_value = present_value * ((1 + interest_rate) ** term)
+        future_value = present_value * (interest_growth + 1)
 
         # Calculate the premium
-        premium = future_value / ((1 + inflation_rate) ** term)
+        premium = future_value / (_compound_growth(inflation_rate, term) + 1)
+
+        return premium
+
+    def calculate_annuity_premiums(self, amounts: List[int], terms: List[int], interest_rates: List[float],
+                                   inflation_rates: List[float]) -> List[float]:
+        """Calculate the annuity premium for each policy in a batch.
+
+        Args:
+            amounts: The annuity amount of each policy.
+            terms: The term of each policy.
+            interest_rates: The interest rate of each policy.
+            inflation_rates: The inflation rate of each policy.
+
+        Returns:
+            The premiums, in the same order as the policies.
+
+        Raises:
+            ValueError: If the policy fields are not all of the same length.
+        """
+        if not len(amounts) == len(terms) == len(interest_rates) == len(inflation_rates):
+            raise ValueError("amounts, terms, interest_rates and inflation_rates must have the same length")
+
+        calculate_annuity_premium = self.calculate_annuity_premium
+        return [calculate_annuity_premium(amount, term, interest_rate, inflation_rate)
+                for amount, term, interest_rate, inflation_rate in zip(amounts, terms, interest_rates, inflation_rates)]
+
+    def calculate_excess_of_loss_premium(self, simulated_losses: List[float], retention: float, limit: float,
+                                         risk_loading: float, surplus: float, target_surplus: float,
+                                         surplus_sensitivity: float) -> float:
+        """Calculate the premium of an excess of loss reinsurance layer from simulated losses.
+
+        The layer pays min((X - retention)+, limit) for a loss X. The base premium is the expected payout plus a
+        loading on its standard deviation, and it is surcharged when the surplus of the ceding company is below the
+        target surplus: premium * exp(surplus_sensitivity * (target_surplus - surplus)). A surcharge too large to be
+        represented as a float makes the premium infinite.
+
+        Args:
+            simulated_losses: The simulated losses of the reinsured line.
+            retention: The retention of the layer.
+            limit: The limit of the layer.
+            risk_loading: The loading applied to the standard deviation of the payout.
+            surplus: The current surplus of the ceding company.
+            target_surplus: The surplus below which the premium is surcharged.
+            surplus_sensitivity: The non-negative sensitivity of the surcharge to the surplus shortfall.
+
+        Returns:
+            The premium of the reinsurance layer.
+
+        Raises:
+            ValueError: If no simulated losses are given.
+        """
+        if not simulated_losses:
+            raise ValueError("simulated_losses must contain at least one simulated loss")
+
+        payouts = [min(max(loss - retention, 0.0), limit) for loss in simulated_losses]
+        premium = statistics.fmean(payouts) + risk_loading * statistics.pstdev(payouts)
+
+        # Only a positive premium of a ceding company short of its target surplus is surcharged
+        if surplus < target_surplus and premium > 0:
+            surcharge_exponent = surplus_sensitivity * (target_surplus - surplus)
+            if surcharge_exponent > _MAX_EXP_ARGUMENT:
+                return math.inf
+            premium *= math.exp(surcharge_exponent)
 
         return premium
 
     def provide_customized_reinsurance(self, iorp: IORP, coverage_amount: int, reinsurance_terms: Dict[str, Any]):
+        """Provide reinsurance coverage to an IORP tailored to its size, risk profile and contract terms.
+
+        Args:
+            iorp: The IORP to be reinsured.
+            coverage_amount: The coverage amount requested by the IORP.
+            reinsurance_terms: The terms of the reinsurance contract, with the "contract_length" in years and the
+                "exclusions" as a set of excluded risks.
+
+        Returns:
+            The reinsurance amount.
+        """
         # Determine the reinsurance amount based on the size and financial stability of the IORP
-        if iorp.total_assets > 100000 and iorp.calculate_risk_profile() == "low":
-            reinsurance_amount = coverage_amount
-        elif iorp.total_assets > 100000 and iorp.calculate_risk_profile() == "medium":
-            reinsurance_amount = coverage_amount * 0.75
-        elif iorp.total_assets > 100000 and iorp.calculate_risk_profile() == "high":
-            reinsurance_amount = coverage_amount * 0.50
-        elif iorp.total_assets > 100000 and iorp.calculate_risk_profile() == "low":
-            reinsurance_amount = coverage_amount * 0.50
-        elif iorp.total_assets > 100000 and iorp.calculate_risk_profile() == "medium":
-            reinsurance_amount = coverage_amount * 0.25
+        if iorp.total_assets > 100000:
+            reinsurance_share = REINSURANCE_SHARE_BY_RISK_PROFILE.get(iorp.calculate_risk_profile(), 0.0)
         else:
-            reinsurance_amount = 0
-
-        # Consider the terms and conditions of the reinsurance contract
-        if reinsurance_terms["contract_length"] > 5 and reinsurance_terms["exclusions"] == []:
-            reinsurance_amount *= 1.1
-        elif reinsurance_terms["contract_length"] > 5:
-            reinsurance_amount *= 1.05
-        elif not reinsurance_terms["exclusions"]:
-            reinsurance_amount *= 1.05
-
-        # Print the final reinsurance amount
-        print(f"Insurance company is providing customized reinsurance coverage for {reinsurance_amount} dollars to IORP {iorp.name}.")
+            reinsurance_share = 0.0
+        reinsurance_amount = coverage_amount * reinsurance_share
+
+        # Consider the terms and conditions of the reinsurance contract, a long contract and a contract without
+        # exclusions each add 5% to the reinsurance amount
+        long_contract = reinsurance_terms["contract_length"] > 5
+        no_exclusions = not reinsurance_terms["exclusions"]
+        reinsurance_amount *= 1 + 0.05 * (long_contract + no_exclusions)
+
+        # Log the final reinsurance amount
+        logger.debug("Insurance company is providing customized reinsurance coverage for %s dollars to IORP %s.",
+                     reinsurance_amount, iorp.name)
         return reinsurance_amount
 
 
 if __name__ == "__main__":
+    # Show the debug messages of the simulation alongside the printed results
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
 
     insurance_company = InsuranceCompany("Acme Insurance", 100000000, 500000000, 400000000, 100000, 200000000, 1.6, 1.2)
 
@@ -293,8 +477,8 @@ if __name__ == "__main__":
     for stock in stocks:
         # Create a Position object for the stock with a quantity of 50
         position = Position(stock, 50)
-        # Add the Position object to the positions attribute of the IORP object
-        iorp.positions.append(position)
+        # Add the Position object to the positions held by the IORP
+        iorp.add_position(position)
 
     insurance_company.update_reinsurance_terms(iorp, 25000000)
 
@@ -349,13 +533,6 @@ if __name__ == "__main__":
     # Print the SCR factor under each stress test scenario
     for scenario, scr_factor in scr_factors.items():
         print(f"SCR factor under {scenario}: {scr_factor:.2%}")
-    INDUSTRY_RISK_FACTORS = {
-        "manufacturing": 1.2,
-        "construction": 1.5,
-        "retail": 0.9,
-        "finance": 1.0,
-        "technology": 0.8
-    }
     print("### SME INTERACTIONS ###")
 
     income_statement = {
@@ -380,12 +557,22 @@ if __name__ == "__main__":
     premium = insurance_company.calculate_premium(sme)
     print(f"The premium for the SME {sme.name} is {premium}")
 
+    portfolio = [sme, SME("Beta Ltd", "A", 812, "technology", 2000000, 1000000, financial_statements)]
+    print("The premiums for the SME portfolio are", insurance_company.calculate_portfolio_premiums(portfolio))
+
     print("### IORP INTERACTIONS ###")
 
     print("The annuity Premium", insurance_company.calculate_annuity_premium(100000, 30, 0.03, 0.02))
+    print("The annuity Premiums", insurance_company.calculate_annuity_premiums([100000, 50000], [30, 20],
+                                                                               [0.03, 0.04], [0.02, 0.02]))
+
+    simulated_losses = [0, 20000, 50000, 80000, 150000]
+    print("The excess of loss reinsurance premium",
+          insurance_company.calculate_excess_of_loss_premium(simulated_losses, 25000, 100000, 0.2, 900000, 1000000,
+                                                             0.000001))
 
     insurance_company.provide_customized_reinsurance(iorp, 10000,
-                                                     {"contract_length": 10, "exclusions": ["natural disasters"]})
+                                                     {"contract_length": 10, "exclusions": {"natural disasters"}})
 
 
 
@@ -1,8 +1,18 @@
-from typing import List, Any
+from typing import Dict, List, Any, Tuple
+from bisect import bisect_right
 import datetime
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
 
 
 class Asset:
+    __slots__ = ("identifier", "market_price")
+
+    # Tag identifying the asset type, used to look up how the asset is valued
+    KIND = 0
+
     def __init__(self, identifier: Any, market_price: float) -> None:
         """Initialize an Asset with an identifier and a market value.
 
@@ -23,6 +33,8 @@ class Asset:
 
 
 class Position:
+    __slots__ = ("asset", "quantity")
+
     def __init__(self, asset: Asset, quantity: int) -> None:
         """Initialize a Position with an Asset and a quantity.
 
@@ -47,19 +59,25 @@ class Position:
 
 
 class Stock(Asset):
-    def __init__(self, ticker: str, market_value: float, dividend_yield: float = 0) -> None:
-        """Initialize a Stock with a ticker, market value, and dividend yield.
+    __slots__ = ("dividend_yield", "num_shares")
+
+    KIND = 1
+
+    def __init__(self, ticker: str, market_value: float, dividend_yield: float = 0, num_shares: int = 50) -> None:
+        """Initialize a Stock with a ticker, market value, dividend yield, and number of shares.
 
         Parameters:
         - ticker: The ticker symbol of the Stock.
         - market_value: The market value of the Stock.
         - dividend_yield: The dividend yield of the Stock.
+        - num_shares: The number of shares of the Stock held.
         """
         # Call the superclass constructor to initialize the identifier and market value attributes
         super().__init__(ticker, market_value)
 
-        # Initialize the dividend yield attribute
+        # Initialize the dividend yield and number of shares attributes
         self.dividend_yield = dividend_yield
+        self.num_shares = num_shares
 
     def calculate_dividend_yield(self) -> float:
         """Calculate the dividend yield of the Stock.
@@ -71,21 +89,28 @@ class Stock(Asset):
 
 
 class Bond(Asset):
-    def __init__(self, identifier: str, market_value: float, coupon_rate: float, maturity_date: datetime.date) -> None:
-        """Initialize a Bond with an identifier, market value, coupon rate, and maturity date.
+    __slots__ = ("coupon_rate", "maturity_date", "face_value")
+
+    KIND = 2
+
+    def __init__(self, identifier: str, market_value: float, coupon_rate: float, maturity_date: datetime.date,
+                 face_value: float = 1.0) -> None:
+        """Initialize a Bond with an identifier, market value, coupon rate, maturity date, and face value.
 
         Parameters:
         - identifier: The identifier of the Bond.
-        - market_value: The market value of the Bond.
+        - market_value: The market value of the Bond per unit of face value.
         - coupon_rate: The coupon rate of the Bond.
         - maturity_date: The maturity date of the Bond.
+        - face_value: The face value of the Bond held.
         """
         # Call the superclass constructor to initialize the identifier and market value attributes
         super().__init__(identifier, market_value)
 
-        # Initialize the coupon rate and maturity date attributes
+        # Initialize the coupon rate, maturity date and face value attributes
         self.coupon_rate = coupon_rate
         self.maturity_date = maturity_date
+        self.face_value = face_value
 
     def calculate_coupon_payment(self) -> float:
         """Calculate the coupon payment of the Bond.
@@ -94,7 +119,7 @@ class Bond(Asset):
         The coupon payment of the Bond.
         """
         # Calculate the coupon payment by multiplying the market value by the coupon rate
-        coupon_payment = self.market_value * self.coupon_rate
+        coupon_payment = self.market_price * self.coupon_rate
 
         return coupon_payment
 
@@ -105,12 +130,30 @@ class Bond(Asset):
         The maturity value of the Bond.
         """
         # Calculate the maturity value by adding the coupon payment to the market value
-        maturity_value = self.market_value + self.calculate_coupon_payment()
+        maturity_value = self.market_price + self.calculate_coupon_payment()
 
         return maturity_value
 
 
+# Upper bounds (exclusive) of the risk scores of the low and medium risk profiles, and the risk profile of each band
+RISK_SCORE_BANDS = (0.5, 0.75)
+RISK_PROFILES = ("low", "medium", "high")
+
+# Valuation of a single asset for each asset KIND: other asset types are valued at their current market price, stocks
+# at their current market price times the number of shares and bonds at their current market price times the face value
+_ASSET_VALUERS = (
+    lambda asset: asset.market_price,
+    lambda asset: asset.market_price * asset.num_shares,
+    lambda asset: asset.market_price * asset.face_value,
+)
+
+
 class IORP:
+    # The reinsurance attributes are set by the insurance company when it updates the reinsurance terms
+    __slots__ = ("name", "assets", "solvency_ratio", "asset_diversification", "industry_risk", "total_assets",
+                 "total_liabilities", "num_employees", "geographical_location", "industry_sector", "hedge_ratio",
+                 "positions", "reinsurance_amount", "reinsurance_terms_updated")
+
     def __init__(self, name: str, assets: List[Asset], solvency_ratio: float, asset_diversification: float, industry_risk: float, total_assets: float,
                  total_liabilities: float, num_employees: int, geographical_location: str,
                  industry_sector: str, hedge_ratio: float) -> None:
@@ -125,7 +168,22 @@ class IORP:
         self.geographical_location = geographical_location
         self.industry_sector = industry_sector
         self.hedge_ratio = hedge_ratio
-        self.positions = []
+        # Positions held by the IORP, keyed by the identifier of their asset
+        self.positions: Dict[Any, Position] = {}
+
+    def add_position(self, position: Position) -> None:
+        """Add a Position to the IORP, merging it with the position already held in the same asset, if any.
+
+        Parameters:
+        - position: The Position to add.
+        """
+        identifier = position.asset.identifier
+        existing_position = self.positions.get(identifier)
+        if existing_position is None:
+            self.positions[identifier] = position
+        else:
+            self.positions[identifier] = Position(existing_position.asset,
+                                                  existing_position.quantity + position.quantity)
 
     def calculate_nav(self) -> float:
         """Calculate the net asset value (NAV) of the IORP.
@@ -133,11 +191,8 @@ class IORP:
         Returns:
         The NAV of the IORP.
         """
-        # Calculate the market value of each asset held by the IORP
-        asset_market_values = [asset.calculate_market_value() for asset in self.assets]
-
-        # Return the sum of the asset market values
-        return sum(asset_market_values)
+        # Sum the market value of each asset held by the IORP
+        return sum(asset.calculate_market_value() for asset in self.assets)
 
     def calculate_market_value(self) -> float:
         """Calculate the current market value of the IORP's assets.
@@ -145,11 +200,26 @@ class IORP:
         Returns:
         The current market value of the IORP's assets.
         """
-        # Calculate the market value of each asset held by the IORP
-        asset_values = [self.calculate_asset_value(asset) for asset in self.assets]
+        # Sum the market value of each asset held by the IORP
+        return sum(map(self.calculate_asset_value, self.assets))
+
+    def calculate_aggregates(self) -> Tuple[float, float, float]:
+        """Calculate the NAV, the current market value, and the net delta of the IORP together.
+
+        The NAV and the market value are accumulated in a single pass over the assets, so callers that need several of
+        these figures at once do not walk the assets repeatedly.
+
+        Returns:
+        The NAV, the current market value of the IORP's assets, and the net delta of all positions held by the IORP.
+        """
+        nav = 0
+        market_value = 0
+        calculate_asset_value = self.calculate_asset_value
+        for asset in self.assets:
+            nav += asset.calculate_market_value()
+            market_value += calculate_asset_value(asset)
 
-        # Return the sum of the values of all assets
-        return sum(asset_values)
+        return nav, market_value, self.calculate_net_delta()
 
     def calculate_asset_value(self, asset: Asset) -> float:
         """Calculate the current market value of a single asset.
@@ -161,25 +231,12 @@ class IORP:
         The current market value of the asset.
         """
         # Calculate the market value of the asset based on its type
-        if isinstance(asset, Stock):
-            # For stocks, use the current market price and number of shares
-            return asset.market_price * 50
-        elif isinstance(asset, Bond):
-            # For bonds, use the current market price and face value
-            return asset.market_price * asset.face_value
-        else:
-            # For other asset types, use the current market price
-            return asset.market_price
+        return _ASSET_VALUERS[asset.KIND](asset)
 
     def calculate_risk_profile(self) -> str:
         # Calculate the risk profile of the IORP based on its solvency ratio, asset diversification, and industry risk
         risk_score = self.solvency_ratio * self.asset_diversification * self.industry_risk
-        if risk_score < 0.5:
-            return "low"
-        elif risk_score < 0.75:
-            return "medium"
-        else:
-            return "high"
+        return RISK_PROFILES[bisect_right(RISK_SCORE_BANDS, risk_score)]
 
     def implement_risk_mitigation(self, strategy: str, threshold: float) -> None:
         """Implement a risk mitigation strategy for the IORP.
@@ -193,14 +250,15 @@ class IORP:
             current_market_value = self.calculate_market_value()
             # Calculate the current market value of the IORP's assets
             if current_market_value < threshold:  # Check if the market value has fallen below the threshold
-                print(f"Selling assets to mitigate risk. Current market value: {current_market_value:.2f}, threshold: {threshold:.2f}")
+                logger.debug("Selling assets to mitigate risk. Current market value: %.2f, threshold: %.2f",
+                             current_market_value, threshold)
             else:
-                print("Market value is above the stop-loss threshold. No action needed.")
+                logger.debug("Market value is above the stop-loss threshold. No action needed.")
         elif strategy == "hedging":
                 # Implement a hedging strategy to offset potential losses from market volatility
                 self._hedge_positions()  # Call a private method to implement the hedging strategy
         else:
-            print("Invalid risk mitigation strategy")
+            logger.warning("Invalid risk mitigation strategy: %s", strategy)
 
     def _hedge_positions(self) -> None:
         """Implement a delta hedging strategy to offset potential losses from market volatility."""
@@ -217,13 +275,13 @@ class IORP:
 
         # If the net delta is positive, sell stocks to offset the delta
         if net_delta > 0:
-            print(f"Selling {option_investment:.2f} worth of stocks to offset positive delta")
+            logger.debug("Selling %.2f worth of stocks to offset positive delta", option_investment)
         # If the net delta is negative, buy stocks to offset the delta
         elif net_delta < 0:
-            print(f"Buying {option_investment:.2f} worth of stocks to offset negative delta")
+            logger.debug("Buying %.2f worth of stocks to offset negative delta", option_investment)
         # If the net delta is zero, no action is needed
         else:
-            print("Net delta is zero. No action needed.")
+            logger.debug("Net delta is zero. No action needed.")
 
     def calculate_net_delta(self) -> float:
         """Calculate the net delta of all positions held by the IORP.
@@ -231,11 +289,8 @@ class IORP:
         Returns:
         The net delta of all positions held by the IORP.
         """
-        # Calculate the delta of each position held by the IORP
-        position_deltas = [self.calculate_position_delta(position) for position in self.positions]
-
-        # Return the sum of all position deltas
-        return sum(position_deltas)
+        # Sum the delta of each position held by the IORP
+        return sum(map(self.calculate_position_delta, self.positions.values()))
 
     def calculate_position_delta(self, position: Position) -> float:
         """Calculate the delta of a single position.
@@ -256,6 +311,9 @@ class IORP:
 
 
 if __name__ == "__main__":
+    # Show the debug messages of the simulation alongside the printed results
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s", stream=sys.stdout)
+
     # Create an Asset object
     stock = Stock("ABC", 50.00, 1)
 
@@ -276,13 +334,17 @@ if __name__ == "__main__":
     for stock in stocks:
         # Create a Position object for the stock with a quantity of 50
         position = Position(stock, 50)
-        # Add the Position object to the positions attribute of the IORP object
-        iorp.positions.append(position)
+        # Add the Position object to the positions held by the IORP
+        iorp.add_position(position)
 
     # Calculate the NAV of the IORP
     nav = iorp.calculate_nav()
     print(f"The NAV of the IORP is {nav:.2f}")
 
+    # Calculate the NAV, market value and net delta of the IORP in one go
+    nav, market_value, net_delta = iorp.calculate_aggregates()
+    print(f"The NAV, market value and net delta of the IORP are {nav:.2f}, {market_value:.2f} and {net_delta:.2f}")
+
     # Calculate the risk profile of the IORP
     risk_profile = iorp.calculate_risk_profile()
 
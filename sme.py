@@ -2,6 +2,8 @@ from typing import Dict, List, Any
 
 
 class SME:
+    __slots__ = ("name", "credit_rating", "credit_score", "industry", "assets", "liabilities", "financial_statements")
+
     def __init__(self, name: str, credit_rating: str, credit_score: int, industry: str, assets: float, liabilities: float, financial_statements: dict):
         self.name = name
         self.credit_rating = credit_rating